@@ -9,9 +9,8 @@ Meaning understanding stuff like::
 from __future__ import annotations
 
 import ast
-from functools import lru_cache
 import sys
-from typing import Callable, Iterator, Optional, List, Any, Union
+from typing import Callable, Dict, Iterator, Optional, List, Any, Type, Union
 
 from .import nodes, exceptions
 from .import _typing
@@ -188,9 +187,15 @@ def _raise_no_assigned_stmts_method(self:ASTNodeT, _:ASTNodeT, context: Optional
         "Node {node!r} is currently not supported by assigned_stmts().", node=self, context=context
     )
 _globals = globals()
-@lru_cache()
+_ASSIGNED_STMTS_METHS: Dict[Type[ast.AST], AssignedStmtsCall] = {}
+
 def _get_assigned_stmts_meth(node: ASTNodeT) -> AssignedStmtsCall:
-    return _globals.get(f'_assigned_stmts_{node.__class__.__name__}', _raise_no_assigned_stmts_method)
+    # The lookup is cached per node type: caching it per node would keep the nodes alive.
+    try:
+        return _ASSIGNED_STMTS_METHS[type(node)]
+    except KeyError:
+        meth = _ASSIGNED_STMTS_METHS[type(node)] = _globals.get(f'_assigned_stmts_{node.__class__.__name__}', _raise_no_assigned_stmts_method)
+        return meth
 
 def assigned_stmts(
     self: ASTNodeT,
@@ -8,6 +8,7 @@ Like astroid's inference context utilities, but more simple.
 # without support for callable context or bound nodes.
 from __future__ import annotations
 
+from collections import OrderedDict
 import contextlib
 import pprint
 import ast
@@ -17,6 +18,28 @@ from ._typing import ASTNode as ASTNodeT
 
 _InferenceCache = Dict[ASTNodeT, Tuple[ASTNodeT]]
 
+class _LRUInferenceCache(OrderedDict): # type:ignore[type-arg]
+    """
+    An inference cache that holds at most ``maxsize`` entries, 
+    the least recently used entries are discarded first.
+    """
+    __slots__ = ('maxsize',)
+
+    def __init__(self, maxsize: int) -> None:
+        super().__init__()
+        self.maxsize = maxsize
+    
+    def __getitem__(self, key: ASTNodeT) -> Tuple[ASTNodeT]:
+        value: Tuple[ASTNodeT] = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+    
+    def __setitem__(self, key: ASTNodeT, value: Tuple[ASTNodeT]) -> None:
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
 class InferenceContext:
     """
     Provide context for inference.
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import ast
-from typing import List, Optional, Tuple, Union
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple, Union
 from .nodes import ASTNode, is_assign_name, is_del_name, are_exclusive, is_orelse, get_if_statement_ancestor
 # TODO: we don't actaully need to import ASTNode here and is_assign_name, is_del_name should go into new module
 # This avoid to have import this module from within the function in _lookup.py.
@@ -89,19 +90,40 @@ def optionally_assigns(self: 'ASTNode') -> bool:
 # Use it in are_exclusive() and also use in the same fashion to filter nodes based
 # on pre-evaluated ifs conditions.
 
+def _get_statements_linenos(frame: 'ASTNode', stmt_nodes: List[LocalsAssignT]) -> Optional[List[int]]:
+    """
+    Returns the line numbers of the statements of the given locals entry, 
+    or None if the statements are not sorted by line number.
+
+    The result is cached on the frame, it's recomputed when names are added to the locals entry.
+    """
+    cache: Optional[Dict[int, Tuple[List[LocalsAssignT], int, Optional[List[int]]]]] = frame._locals_linenos
+    if cache is None:
+        cache = frame._locals_linenos = {}
+    entry = cache.get(id(stmt_nodes))
+    if entry is not None and entry[0] is stmt_nodes and entry[1] == len(stmt_nodes):
+        return entry[2]
+
+    linenos: Optional[List[int]] = [node.statement.lineno for node in stmt_nodes]
+    assert linenos is not None
+    if any(a > b for a, b in zip(linenos, linenos[1:])):
+        linenos = None
+    cache[id(stmt_nodes)] = (stmt_nodes, len(stmt_nodes), linenos)
+    return linenos
+
 def _get_filtered_node_statements(
-    base_node: 'ASTNode', stmt_nodes: List[LocalsAssignT]
+    base_node: 'ASTNode', stmt_nodes: List[LocalsAssignT], stop:Optional[int]=None,
 ) -> List[Tuple[LocalsAssignT, Union[ASTstmt, ASTModuleT]]]:
     """
-    Returns the list of tuples (node, node.statement) for all stmt_nodes.
+    Returns the list of tuples (node, node.statement) for the stmt_nodes, up to the index ``stop``.
     
     Special handling for ExceptHandlers, see code comments.
     """
-    statements = [(node, node.statement) for node in stmt_nodes]
+    statements = [(node, node.statement) for node in stmt_nodes[:stop]]
     # Next we check if we have ExceptHandlers that are parent
     # of the underlying variable, in which case the last one survives
-    if len(statements) > 1 and all(
-        isinstance(stmt, ast.ExceptHandler) for _, stmt in statements
+    if len(stmt_nodes) > 1 and all(
+        isinstance(node.statement, ast.ExceptHandler) for node in stmt_nodes
     ):
         statements = [
             (node, stmt) for node, stmt in statements if stmt.parent_of(base_node)
@@ -237,7 +259,16 @@ def filter_stmts(base_node: 'ASTNode', stmts:List[LocalsAssignT], frame: 'ASTNod
 
     _stmts:List['ASTNode'] = [] # this variable is the return value of the function, it's the "filtered statements"
     _stmt_parents = []
-    statements = _get_filtered_node_statements(base_node, stmts)
+
+    # When line filtering is on, the statements defined after our location are never considered, 
+    # so we find the cut with a binary search instead of going through all of them.
+    stop = None
+    if mylineno > 0:
+        linenos = _get_statements_linenos(frame, stmts)
+        if linenos is not None:
+            stop = bisect_right(linenos, mylineno)
+
+    statements = _get_filtered_node_statements(base_node, stmts, stop)
     
     # Iterate over all statements anf filter ignorables
     for node, stmt in statements:
@@ -42,6 +42,7 @@ class BinOp(ast.BinOp, ConcreteASTNode):...
 class Expr(ast.Expr, ConcreteASTNode):...
 class Subscript(ast.Subscript, ConcreteASTNode):...
 class alias(ast.alias, ConcreteASTNode):...
+class ExceptHandler(ast.ExceptHandler, ConcreteASTNode):...
 
 class List(ast.List, ConcreteInstance):...
 class Tuple(ast.Tuple, ConcreteInstance):...
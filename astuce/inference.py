@@ -5,10 +5,9 @@ Core of the inference engine.
 
 import ast
 import contextlib
-import functools
 import itertools
 import sys
-from typing import Any, Callable, Iterable, Iterator, Optional, List, Type, Union, cast
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, Optional, List, Type, Union, cast
 from . import _context, nodes, exceptions, _decorators
 from . import _typing
 from ._typing import ASTNode as ASTNodeT, _InferMethT, InferResult, UninferableT
@@ -17,6 +16,9 @@ from ._context import OptionalInferenceContext, copy_context, InferenceContext
 from ._assigned_statements import assigned_stmts
 from ._inference_decorators import path_wrapper, yes_if_nothing_inferred, raise_if_nothing_inferred
 
+if TYPE_CHECKING:
+    from .parser import Parser
+
 # An idea to improve support for builtins: https://stackoverflow.com/a/71969838
 
 def _infer_stmts(
@@ -68,7 +70,25 @@ def infer(self:ASTNodeT, context: OptionalInferenceContext=None) -> InferResult:
     """
     if not context:
         # nodes_inferred?
-        yield from _infer(self, context=context)
+        # detached nodes have no parser
+        parser = cast(Optional['Parser'], self._parser)
+        if parser is None:
+            yield from _infer(self, context=context)
+            return
+        
+        # Memoize the results on the node, until the next time the inference cache is invalidated.
+        generation = parser._inference_generation
+        memo = self.__dict__.get('_inferred')
+        if memo is not None and memo[0] == generation:
+            yield from memo[1]
+            return
+        
+        results = []
+        for result in _infer(self, context=context):
+            results.append(result)
+            yield result
+        # Only reached if the generator has been exhausted without errors.
+        self._inferred = (generation, tuple(results))
         return
 
     if self in context.inferred:
@@ -175,15 +195,9 @@ def _get_end_of_frame_sentinel(frame_node:_typing.FrameNodeT) -> _typing.ASTstmt
 def _is_end_of_frame_sentinel(node:_typing.ASTNode) -> bool:
     if not isinstance(node, ast.Expr):
         return False
-    try:
-        v = ast.literal_eval(node.value)
-    except ValueError:
-        return False
-    else:
-        if v == nodes._END_OF_FRAME_SENTINEL_CONSTANT:
-            return True
-    
-    return False
+    # the sentinel value is always a Constant, no need to literal_eval() it.
+    value = node.value
+    return isinstance(value, ast.Constant) and value.value == nodes._END_OF_FRAME_SENTINEL_CONSTANT
 
 def get_attr(ctx: _typing.FrameNodeT, name:str, *, ignore_locals:bool=False, context:OptionalInferenceContext=None) -> List[ASTNodeT]:
     """
@@ -303,9 +317,15 @@ def _raise_no_infer_method(node:ASTNodeT, context: OptionalInferenceContext) ->
     )
 
 _globals = globals()
-@functools.lru_cache()
+_INFER_METHS: Dict[Type[ast.AST], _InferMethT] = {}
+
 def _get_infer_meth(node: ASTNodeT) -> _InferMethT:
-    return _globals.get(f'_infer_{node.__class__.__name__}', _raise_no_infer_method)
+    # The lookup is cached per node type: caching it per node would keep the nodes alive.
+    try:
+        return _INFER_METHS[type(node)]
+    except KeyError:
+        meth = _INFER_METHS[type(node)] = _globals.get(f'_infer_{node.__class__.__name__}', _raise_no_infer_method)
+        return meth
 
 def _infer_end(node:ASTNodeT, context: OptionalInferenceContext) -> InferResult:
     """Inference's end for nodes that yield themselves on inference
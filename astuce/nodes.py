@@ -1,7 +1,6 @@
 
 import enum
 from functools import lru_cache
-import functools
 import logging
 import re
 from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Sequence, List, Tuple, Type, Union, cast, TYPE_CHECKING, overload
@@ -51,6 +50,88 @@ class Uninferable:
         return False
 
 
+_CHILD_FIELDS: Dict[Type[ast.AST], Tuple[Tuple[str, bool], ...]] = {}
+
+# The builtin types of the ASDL grammar, the fields of these types never hold nodes.
+_ASDL_BUILTIN_TYPES = frozenset(('identifier', 'int', 'string', 'constant', 'object', 'singleton', 'bytes'))
+_ASDL_FIELD_RE = re.compile(r'(\w+)([*?]?) (\w+)')
+
+def _get_schema_child_fields(klass: Type[ast.AST]) -> Optional[Tuple[Tuple[str, bool], ...]]:
+    """
+    Classify the fields from the ASDL signature that is the docstring of the 
+    ast classes, i.e. ``Call(expr func, expr* args, keyword* keywords)``.
+
+    Returns None if the signature is not available or does not match the class fields.
+    """
+    for base in klass.__mro__:
+        if base.__module__ in ('ast', '_ast'):
+            break
+    else:
+        return None
+    doc = base.__doc__ or ''
+    name = base.__name__
+    if doc == name:
+        # no fields
+        signature = ''
+    elif doc.startswith(name + '(') and doc.endswith(')'):
+        signature = doc[len(name) + 1:-1]
+    else:
+        return None
+    
+    fields = []
+    names = []
+    for item in filter(None, signature.split(', ')):
+        match = _ASDL_FIELD_RE.fullmatch(item)
+        if match is None:
+            return None
+        type_, quantifier, field = match.groups()
+        names.append(field)
+        if type_ not in _ASDL_BUILTIN_TYPES:
+            fields.append((field, quantifier == '*'))
+    if tuple(names) != tuple(klass._fields):
+        return None
+    return tuple(fields)
+
+def _get_child_fields(node: ast.AST) -> Tuple[Tuple[str, bool], ...]:
+    """
+    Get the fields of this node's class that can hold child nodes, in order. 
+    
+    Returns tuples (field name, whether it's a list of nodes). 
+    The fields holding only scalar values (identifiers, constants) are left out.
+
+    The classification is computed once per class from the ASDL signature of the class. 
+    When it's not available, it's based on the node values, and only cached if all fields are set: 
+    a field that is ``None`` is considered as an optional node field.
+    """
+    try:
+        return _CHILD_FIELDS[type(node)]
+    except KeyError:
+        r = _get_schema_child_fields(type(node))
+        if r is not None:
+            _CHILD_FIELDS[type(node)] = r
+            return r
+        
+        fields = []
+        complete = True
+        for name in node._fields:
+            value = getattr(node, name, None)
+            if isinstance(value, list):
+                fields.append((name, True))
+            elif isinstance(value, ast.AST):
+                fields.append((name, False))
+            elif value is None:
+                # a missing or None field could as well be a list in another tree
+                complete = False
+                fields.append((name, False))
+        r = tuple(fields)
+        if complete:
+            _CHILD_FIELDS[type(node)] = r
+        return r
+
+# Node types that never have children, additionally to nodes that do not have any fields 
+# like expression contexts and operators.
+_TERMINAL_NODES = (ast.Constant, ast.alias, ast.Global, ast.Nonlocal)
+
 class ASTNode:
     """
     This class is dynamically added to the bases of each AST node class.
@@ -67,10 +148,35 @@ class ASTNode:
     """
     
     _locals: Dict[str, List[_typing.LocalsAssignT]] = None # type:ignore
-    _parser: 'Parser' = None # type:ignore
+    _locals_linenos: Optional[Dict[int, Tuple[List[_typing.LocalsAssignT], int, Optional[List[int]]]]] = None
     _modname: Optional[str] = None
     _is_package: bool = False
     _filename: Optional[str] = None
+    
+    # Pre-order interval of the node in the tree, set while building the module.
+    # The descendants of a node are the nodes such that: self._enter < node._enter < self._exit.
+    _enter: int = -1
+    _exit: int = -1
+
+    # Memoized result of unparse()
+    _unparsed: Optional[str] = None
+
+    @cached_property
+    def _parser(self) -> 'Parser':
+        """
+        The parser of this node. 
+
+        Only modules and the nodes created during inference store it, 
+        the other nodes look it up in their ancestors the first time.
+        """
+        node: Optional[_typing.ASTNode] = self.parent
+        while node is not None:
+            parser = node.__dict__.get('_parser')
+            if parser is not None:
+                return parser
+            node = node.parent
+        # detached nodes have no parser
+        return cast('Parser', None)
 
     @cached_property
     def root(self) -> _typing.Module:
@@ -128,8 +234,10 @@ class ASTNode:
         """Build and return the children of this node.
 
         Returns:
-            A list of children.
+            A list of children. Terminal nodes all share the same empty tuple.
         """
+        if not self._fields or isinstance(self, _TERMINAL_NODES):
+            return ()
         return list(ast.iter_child_nodes(self)) # type:ignore
 
     @cached_property
@@ -176,7 +284,9 @@ class ASTNode:
         Returns:
             The siblings.
         """
-        return [*reversed(self.previous_siblings), *self.next_siblings]
+        children = self.parent.children
+        position = self.position
+        return [*children[:position], *children[position + 1 :]]
 
     @cached_property
     def previous(self) -> '_typing.ASTNode':
@@ -188,10 +298,10 @@ class ASTNode:
         Returns:
             The sibling.
         """
-        try:
-            return self.previous_siblings[0]
-        except IndexError as error:
-            raise LastNodeError("there is no previous node") from error
+        position = self.position
+        if position == 0:
+            raise LastNodeError("there is no previous node")
+        return self.parent.children[position - 1]
 
     @cached_property  # noqa: A003
     def next(self) -> '_typing.ASTNode':  # noqa: A003
@@ -203,10 +313,11 @@ class ASTNode:
         Returns:
             The sibling.
         """
-        try:
-            return self.next_siblings[0]
-        except IndexError as error:
-            raise LastNodeError("there is no next node") from error
+        position = self.position
+        children = self.parent.children
+        if position == len(children) - 1:
+            raise LastNodeError("there is no next node")
+        return children[position + 1]
 
     @cached_property
     def first_child(self) -> '_typing.ASTNode':
@@ -439,6 +550,9 @@ class ASTNode:
             False otherwise.
         :rtype: bool
         """
+        if self._enter >= 0 and node._enter >= 0 and self.root is node.root:
+            return self._enter < node._enter < self._exit
+        # Nodes created during inference do not have an interval.
         return any(self is parent for parent in node.node_ancestors())
 
     @cached_property
@@ -452,8 +566,12 @@ class ASTNode:
                 
         return False
     
-    @lru_cache()
     def unparse(self) -> str:
+        """
+        Unparse this node, the result is memoized on the node.
+
+        :see: `Parser.unparse`
+        """
         return self._parser.unparse(self)
 
     @lru_cache()
@@ -485,19 +603,27 @@ _CONTEXT_MAP = {
     ast.Param: Context.Store,
 }
 
+# Bake the context enumeration onto the ast context classes, 
+# such that get_context() is a simple attribute access.
+for _ctx_type, _ctx in _CONTEXT_MAP.items():
+    _ctx_type._context = _ctx
+del _ctx_type, _ctx
+
+_LOAD = ast.Load()
+
 def is_assign_name(node: Union[ast.Name, ast.Attribute]) -> bool:
     """
     Whether this node is the target of an assigment.
     """
-    return get_context(node) == Context.Store
+    # get_context() inlined, nodes without ctx field are loaded.
+    return type(getattr(node, 'ctx', _LOAD)) is ast.Store
 
 def is_del_name(node: Union[ast.Name, ast.Attribute]) -> bool:
     """
     Whether this node is the target of a del statment.
     """
-    return get_context(node) == Context.Del
+    return type(getattr(node, 'ctx', _LOAD)) is ast.Del
 
-@functools.lru_cache(maxsize=None)
 def get_context(node: Union[ast.Attribute, ast.List, ast.Name, ast.Subscript, ast.Starred, ast.Tuple]) -> Context:
     """
     Wraps the context ast context classes into a more friendly enumeration.
@@ -507,8 +633,9 @@ def get_context(node: Union[ast.Attribute, ast.List, ast.Name, ast.Subscript, as
 
     # Just in case, we use getattr because dynamically created nodes do not have the ctx field.
     try:
-        return _CONTEXT_MAP[type(getattr(node, 'ctx', ast.Load()))] # type:ignore[index]
-    except KeyError as e:
+        ctx: Any = getattr(node, 'ctx', _LOAD)
+        return cast(Context, ctx._context)
+    except AttributeError as e:
         raise ValueError(f"Can't get the context of {node!r}") from e
 
 def is_frame_node(node: 'ASTNode') -> bool:
@@ -517,12 +644,15 @@ def is_frame_node(node: 'ASTNode') -> bool:
     """
     return isinstance(node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda))
 
+_SCOPED_NODE_TYPES = frozenset((ast.AsyncFunctionDef, ast.FunctionDef, ast.ClassDef, ast.Module, 
+                                ast.GeneratorExp, ast.DictComp, ast.SetComp, ast.ListComp, ast.Lambda))
+
 def is_scoped_node(node: 'ASTNode') -> bool:
     """
     Whether this node is a scope.
     """
-    return isinstance(node, (ast.AsyncFunctionDef, ast.FunctionDef, ast.ClassDef, ast.Module, 
-                             ast.GeneratorExp, ast.DictComp, ast.SetComp, ast.ListComp, ast.Lambda))
+    # the answer only depends on the node class
+    return type(node) in _SCOPED_NODE_TYPES
 
 
 def get_module_parent(node: _typing.Module) -> Optional[_typing.Module]:
@@ -652,7 +782,7 @@ def relative_to_absolute(node: ast.ImportFrom) -> str:
     return modname
 
 
-@attr.s(auto_attribs=True)
+@attr.s(auto_attribs=True, slots=True)
 class TypeInfo:
     """
     Optionnaly holds type information.
@@ -822,11 +952,14 @@ def fix_ast(node:_typing.ASTNode, parent:Optional[_typing.ASTNode]) -> _typing.A
         Fix the missing ``parent`` attribute, starting at node.
         Also setup the ``_parser`` attribute.
         """
-        def _fix(_node:_typing.ASTNode, _parent:_typing.ASTNode) -> None:
-            _parent._parser._init_new_node(_node, _parent)
-            for child in _node.children:
-                _fix(child, _node)
-        _fix(node, parent)
+        # Walk the new tree iteratively with ast.iter_child_nodes() rather than 
+        # the 'children' property: no need to cache lists of children on inferred nodes.
+        init_new_node = parent._parser._init_new_node
+        stack: List[Tuple[_typing.ASTNode, _typing.ASTNode]] = [(node, parent)]
+        while stack:
+            _node, _parent = stack.pop()
+            init_new_node(_node, _parent)
+            stack.extend((child, _node) for child in ast.iter_child_nodes(_node))
         return node
 
     if parent is None:
@@ -881,13 +1014,55 @@ def nodes_of_class(
 
     :returns: The node of the given types.
     """
-    if isinstance(self, klass):
-        if predicate is not None:
-            if bool(predicate(self))==True:
-                yield self
-        else:
-            yield self
+    # Iterative pre-order walk: no generator frame per node, 
+    # and only the fields that can hold nodes are looked at, see _get_child_fields().
+    get_child_fields = _get_child_fields
+    AST = ast.AST
+    stack: List[ast.AST] = [self]
+    pop, push = stack.pop, stack.append
+    while stack:
+        node = pop()
+        if isinstance(node, klass) and (predicate is None or predicate(node)):
+            yield node
+        
+        # push the children in reverse order, so they are yielded in order
+        for field, is_list in reversed(get_child_fields(node)):
+            value = getattr(node, field, None)
+            if is_list:
+                # hand-built nodes might not have all their fields
+                for item in reversed(value or ()):
+                    if isinstance(item, AST):
+                        push(item)
+            elif isinstance(value, AST):
+                push(value)
+
+
+def iter_assign_names(self:_typing.ASTNode) -> Iterator[ast.Name]:
+    """Get the `ast.Name` nodes (including this one or below) that are the target of an assignment.
 
-    for child_node in self.children:
-        yield from nodes_of_class(child_node, klass, predicate)
+    Same as ``nodes_of_class(self, ast.Name, is_assign_name)``, 
+    with the type and context checks inlined.
 
+    :returns: The names, in pre-order.
+    """
+    get_child_fields = _get_child_fields
+    AST, Name, Store = ast.AST, ast.Name, ast.Store
+    stack: List[Any] = [self]
+    pop, push = stack.pop, stack.append
+    while stack:
+        node = pop()
+        if type(node) is Name:
+            name: ast.Name = node
+            # names have no child nodes, hand-built ones might lack the ctx field
+            if type(getattr(name, 'ctx', None)) is Store:
+                yield name
+            continue
+        
+        for field, is_list in reversed(get_child_fields(node)):
+            value = getattr(node, field, None)
+            if is_list:
+                for item in reversed(value or ()):
+                    if isinstance(item, AST):
+                        push(item)
+            elif isinstance(value, AST):
+                push(value)
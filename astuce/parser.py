@@ -7,11 +7,14 @@ is the signature of the `parse` function.
 
 __docformat__ = 'restructuredtext'
 
-from functools import lru_cache, partial
+from collections import OrderedDict
+from functools import partial
+import gc
 import warnings
+import weakref
 import sys
 import ast
-from typing import Any, Callable, Dict, Iterator, List, Optional, Union, cast
+from typing import Any, Callable, ClassVar, Dict, Iterable, MutableMapping, Iterator, List, Optional, Tuple, Union, cast
 
 if sys.version_info >= (3,8):
     _parse = partial(ast.parse, type_comments=True)
@@ -37,10 +40,25 @@ else:
             _unparse = _astunparse.unparse
 
 
-from .nodes import _END_OF_FRAME_SENTINEL_CONSTANT, ASTNode, Instance, is_assign_name, is_del_name, is_scoped_node, fix_ast
+from .nodes import (_END_OF_FRAME_SENTINEL_CONSTANT, _SCOPED_NODE_TYPES, ASTNode, Instance, 
+                    is_scoped_node, _get_child_fields, _CHILD_FIELDS)
 from . import _typing, _context
 
 
+# nodes that can be stored in the locals dict
+_LOCALS_ASSIGN_NAME_NODES = frozenset((ast.ClassDef, 
+                                      ast.FunctionDef, 
+                                      ast.AsyncFunctionDef, 
+                                      ast.Name, 
+                                      ast.arg, 
+                                      ast.alias))
+    # ast.Attribute not supported at the moment, 
+    # analysing assigments outside out the scope needs more work.
+
+# Expression contexts of the names that are stored in the locals, 
+# this is is_assign_name() or is_del_name() inlined.
+_STORE_DEL_TYPES = frozenset((ast.Store, ast.Del))
+
 def _set_local(self:'_typing.ASTNode', name:str, node:'ast.AST') -> None:
     """Define that the given name is declared in the given statement node.
 
@@ -52,158 +70,308 @@ def _set_local(self:'_typing.ASTNode', name:str, node:'ast.AST') -> None:
     :param node: The node that defines the given name (i.e ast.Name objects).
     :type node: ASTNode
     """
-    if isinstance(self, ast.NamedExpr):
-        return _set_local(self.frame, name, node)
-    if not is_scoped_node(self):
-        return _set_local(self.parent, name, node)
-
-    # nodes that can be stored in the locals dict
-    LOCALS_ASSIGN_NAME_NODES = (ast.ClassDef, 
-                                ast.FunctionDef, 
-                                ast.AsyncFunctionDef, 
-                                ast.Name, 
-                                ast.arg, 
-                                ast.alias) 
-
-        # ast.Attribute not supported at the moment, 
-        # analysing assigments outside out the scope needs more work.
+    # climb up to the scope, this is is_scoped_node() inlined
+    scope: Any = self
+    while type(scope) not in _SCOPED_NODE_TYPES:
+        if isinstance(scope, ast.NamedExpr):
+            scope = scope.frame
+        else:
+            scope = scope.parent
     
-    assert isinstance(node, LOCALS_ASSIGN_NAME_NODES), f"cannot set {node} as local"
-    assert not node in self.locals.get(name, ()), (self, node)
-    self.locals.setdefault(name, []).append(node) # type:ignore[arg-type]
-
-class _AstuceModuleVisitor(ast.NodeTransformer):
+    # this assertion is stripped in optimized mode (python -O)
+    assert type(node) in _LOCALS_ASSIGN_NAME_NODES, f"cannot set {node} as local"
+    
+    _locals = scope._locals
+    assigned = _locals.get(name)
+    if assigned is None:
+        _locals[name] = [node]
+    else:
+        assigned.append(node)
+
+# What kind of initialization a node requires, see Parser._init_new_node().
+_SCOPED = 'scoped'
+_INSTANCE = 'instance'
+_NODE_KINDS: Dict[type, Optional[str]] = {}
+
+def _get_node_kind(node: ast.AST) -> Optional[str]:
+    """
+    Whether this node is a scoped node, an instance or none of these. 
+    
+    Results are cached per node type.
+    """
+    node_type = type(node)
+    try:
+        return _NODE_KINDS[node_type]
+    except KeyError:
+        pass
+    kind: Optional[str]
+    if is_scoped_node(node):
+        kind = _SCOPED
+    elif isinstance(node, Instance):
+        kind = _INSTANCE
+    else:
+        kind = None
+    _NODE_KINDS[node_type] = kind
+    return kind
+
+# Fields holding expression contexts and operators: ast.parse() shares a single instance 
+# of each of these classes across the whole tree, so there is no point in walking them.
+_SHARED_NODE_FIELDS = frozenset(('ctx', 'op', 'ops'))
+
+_VISITED_FIELDS: Dict[type, Tuple[Tuple[str, bool], ...]] = {}
+
+def _get_visited_fields(node: ast.AST) -> Tuple[Tuple[str, bool], ...]:
+    """
+    Like `nodes._get_child_fields` but leaves out the fields holding expression contexts and operators, 
+    the result is in reverse order, ready to be pushed on the stack.
     """
-    Obviously inspired by astroid rebuilder
+    fields = tuple(reversed([f for f in _get_child_fields(node) 
+                             if f[0] not in _SHARED_NODE_FIELDS]))
+    # only cache what has been cached by _get_child_fields()
+    if type(node) in _CHILD_FIELDS:
+        _VISITED_FIELDS[type(node)] = fields
+    return fields
+
+def _get_import_local_name(alias: ast.alias) -> str:
+    # When ``import x.y``, we don't need the `.y` part
+    # It's currently sufficient to track the information
+    # TODO: 
+    # by confusing ``x.y`` with ``x``,
+    # we might not be able to detect some AttributeError:
+    
+    # >>> import collections
+    # >>> collections.abc.Sized
+    # Traceback (most recent call last):
+    # File "<stdin>", line 1, in <module>
+    # File "/collections/__init__.py", line 55, in __getattr__
+    #     raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    # AttributeError: module 'collections' has no attribute 'abc'
+    
+    # With the current design we 
+    # cannot track whether the abc module has been imported
+    # explicitely or only accessed like an attribute.
+    name = alias.asname or alias.name
+    if '.' in name:
+        # identifiers coming from ast.parse() are already interned, but not this slice
+        name = sys.intern(name[:name.index('.')])
+    return name
+
+def _get_importfrom_local_name(alias: ast.alias) -> str:
+    return alias.asname or alias.name
+
+class _AstuceModuleVisitor:
     """
+    Obviously inspired by astroid rebuilder.
+
+    The tree is walked in a single iterative pass, see `visit`: 
+    there is no recursive ast.NodeVisitor dispatch involved.
+    """
+    __slots__ = ('parser', '_counter', '_assignattr', '_wildcard_import', '_in_except_handler')
+
     # custom ast.AT attributes are: 
-    # '_parser' and 'parent' on all nodes
+    # 'parent' on all nodes, except the shared expression contexts and operators
+    # '_enter' and '_exit' on the same nodes, see ASTNode.parent_of()
+    # '_parser' on module nodes, the other nodes look it up lazily, see ASTNode._parser
     # '_modname', '_is_package' and '_filename' on module nodes
     # '_locals' on scoped nodes
     # 'type_info' on instance nodes
-
-    parent: ASTNode = cast('ASTNode', None)
+    # '_unparsed' on nodes that have been unparsed
+    # '_inferred' on nodes that have been inferred without context, see inference.infer()
 
     def __init__(self, parser:'Parser') -> None:
-        super().__init__()
         self.parser = parser
+        self._counter = 0
+        # The deferred nodes of the visited module, see Parser._drain_deferred()
+        self._assignattr: List[_typing.Attribute] = []
+        self._wildcard_import: List[_typing.ImportFrom] = []
+        # The number of ExceptHandler nodes we're currently in
+        self._in_except_handler = 0
+
+    # Map node types to their visit_* function, or None. This replaces the string formatting 
+    # and getattr() call that ast.NodeVisitor.visit() does for every node.
+    # It's populated lazily, see _get_handler().
+    _dispatch: ClassVar[Dict[type, Optional[Callable[[Any, Any], Optional[ast.AST]]]]] = {}
+
+    @classmethod
+    def _get_handler(cls, node_type: type) -> Optional[Callable[[Any, Any], Optional[ast.AST]]]:
+        handler = getattr(cls, 'visit_' + node_type.__name__, None)
+        cls._dispatch[node_type] = handler
+        return handler
     
-    def visit(self, node: ASTNode) -> Optional[_typing.ASTNode]:
-
-        # Set the 'parent' and '_parser' attributes on all nodes.
-        self.parser._init_new_node(node, self.parent)
-
-        self.parent = node # push new parent
-
-        r = super().visit(cast(ast.AST, node))
+    def visit(self, node: ASTNode) -> ASTNode:
+        """
+        Walk the module iteratively, in pre-order.
 
-        self.parent = node.parent # pop new parent
+        Name, Attribute and arg nodes are handled inline, the other node types are 
+        dispatched to the visit_* methods. These only handle the node itself, the children are 
+        always visited by this method. A visit_* method can return 
+        a new node to replace the visited one (only if the node is an item of a list field).
+        """
+        parser = self.parser
+        modname = node._modname
+        assert modname is not None
+        # start over with fresh lists in case the module is visited again
+        self._assignattr = parser._assignattr[modname] = []
+        self._wildcard_import = parser._wildcard_import[modname] = []
+
+        node_kinds = _NODE_KINDS
+        dispatch = self._dispatch
+        visited_fields = _VISITED_FIELDS
+        assignattr = self._assignattr
+        store_del_types = _STORE_DEL_TYPES
+        Name, Attribute, arg, Store = ast.Name, ast.Attribute, ast.arg, ast.Store
         
-        if self.parent is None:
-            assert isinstance(node, ast.Module)
+        # the module has no parent
+        stack: List[Tuple[Any, Any]] = [(node, None)]
+        node._parser = parser
+        push = stack.append
+        counter = self._counter
         
-        return r
+        while stack:
+            current, parent = stack.pop()
+            if current is None:
+                # all descendants of this node have been visited
+                parent._exit = counter
+                if type(parent) is ast.ExceptHandler:
+                    self._in_except_handler -= 1
+                continue
+
+            # Set the 'parent' attribute on all nodes, this is Parser._init_new_node() 
+            # inlined: nodes are fresh from ast.parse().
+            current.parent = parent
+            node_type = type(current)
+            try:
+                kind = node_kinds[node_type]
+            except KeyError:
+                kind = _get_node_kind(current)
+            if kind is _SCOPED:
+                current._locals = {}
+            elif kind is _INSTANCE:
+                current._init_type_info()
+            
+            current._enter = counter
+            counter += 1
+            
+            # The most frequent node types are handled inline, 
+            # the other ones go through the dispatch table.
+            if node_type is Name:
+                if type(current.ctx) in store_del_types:
+                    _set_local(parent, current.id, current)
+                handler = None
+            elif node_type is Attribute:
+                # Prohibit a local save if we are in an ExceptHandler.
+                if type(current.ctx) is Store and not self._in_except_handler:
+                    assignattr.append(current)
+                handler = None
+            elif node_type is arg:
+                _set_local(parent, current.arg, current)
+                handler = None
+            else:
+                try:
+                    handler = dispatch[node_type]
+                except KeyError:
+                    handler = self._get_handler(node_type)
+            if handler is not None:
+                new = handler(self, current)
+                if new is not None and new is not current:
+                    # replace the node and visit the new one instead
+                    _, siblings = parent.locate_child(current)
+                    assert isinstance(siblings, list)
+                    siblings[siblings.index(current)] = new
+                    # the code of the parent changed
+                    parent._unparsed = None
+                    push((new, parent))
+                    continue
+
+            push((None, current))
+            # push the children in reverse order, so they are visited in order
+            fields = visited_fields.get(node_type)
+            if fields is None:
+                fields = _get_visited_fields(current)
+            for field, is_list in fields:
+                value = getattr(current, field, None)
+                if is_list:
+                    # hand-built nodes might not have all their fields
+                    for item in reversed(value or ()):
+                        if isinstance(item, ast.AST):
+                            push((item, current))
+                elif isinstance(value, ast.AST):
+                    push((value, current))
+        
+        self._counter = counter
+        return node
 
     def _get_end_of_frame_sentinel(self) -> ast.stmt:
         return ast.Expr(ast.Constant(_END_OF_FRAME_SENTINEL_CONSTANT))
     
-    def visit_Module(self, node:_typing.Module) -> _typing.Module:
+    def visit_Module(self, node:_typing.Module) -> None:
         # append "end of" statement
-        node.body += (self._get_end_of_frame_sentinel(),)
-        return self.generic_visit(node)
+        node.body.append(self._get_end_of_frame_sentinel())
 
-    def visit_FunctionDef(self, node: _typing.FunctionDef) -> _typing.FunctionDef:
-        _set_local(node.parent, node.name, node)
-        # append "end of" statement
-        node.body += (self._get_end_of_frame_sentinel(),)
-        return self.generic_visit(node)
-    
-    def visit_AsyncFunctionDef(self, node: _typing.AsyncFunctionDef) -> _typing.AsyncFunctionDef:
+    def _visit_named_frame(self, node: Union[_typing.FunctionDef, _typing.AsyncFunctionDef, _typing.ClassDef]) -> None:
         _set_local(node.parent, node.name, node)
         # append "end of" statement
-        node.body += (self._get_end_of_frame_sentinel(),)
-        return self.generic_visit(node)
+        node.body.append(self._get_end_of_frame_sentinel())
     
-    def visit_ClassDef(self, node: _typing.ClassDef) -> _typing.ClassDef:
-        _set_local(node.parent, node.name, node)
-        # append "end of" statement
-        node.body += (self._get_end_of_frame_sentinel(),)
-        return self.generic_visit(node)
+    # A single handler for the three node types, so they share the same dispatch path.
+    visit_FunctionDef = visit_AsyncFunctionDef = visit_ClassDef = _visit_named_frame
     
-    def visit_Import(self, node: _typing.Import) -> _typing.Import:
-        # save import names in parent's locals:
+    def _set_import_locals(self, node: Union[_typing.Import, _typing.ImportFrom], 
+                           getname: Callable[[ast.alias], str]) -> None:
+        # save import names in parent's locals
+        parent = node.parent
         for a in node.names:
-            
-            # When ``import x.y``, we don't need the `.y` part
-            # It's currently sufficient to track the information
-            # TODO: 
-            # by confusing ``x.y`` with ``x``,
-            # we might not be able to detect some AttributeError:
-            
-            # >>> import collections
-            # >>> collections.abc.Sized
-            # Traceback (most recent call last):
-            # File "<stdin>", line 1, in <module>
-            # File "/collections/__init__.py", line 55, in __getattr__
-            #     raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
-            # AttributeError: module 'collections' has no attribute 'abc'
-            
-            # With the current design we 
-            # cannot track whether the abc module has been imported
-            # explicitely or only accessed like an attribute.
+            _set_local(parent, getname(a), a)
 
-            name = a.asname or a.name 
-            _set_local(node.parent, name.split(".")[0], a)
-        return self.generic_visit(node)
+    def visit_Import(self, node: _typing.Import) -> None:
+        self._set_import_locals(node, _get_import_local_name)
 
-    def visit_ImportFrom(self, node: _typing.ImportFrom) -> _typing.ImportFrom:
-        if any(a.name=='*' for a in node.names):
+    def visit_ImportFrom(self, node: _typing.ImportFrom) -> None:
+        names = node.names
+        # the grammar only allows the wildcard as the sole imported name
+        if len(names) == 1 and names[0].name == '*':
             # store wildcard imports to be resolved after
-            self.parser._wildcard_import.append(node)
+            self._wildcard_import.append(node)
         else:
-            for a in node.names:
-                name = a.asname or a.name
-                _set_local(node.parent, name, a)
-        return self.generic_visit(node)
-    
-    def visit_arg(self, node: _typing.arg) -> _typing.arg:
-        _set_local(node.parent, node.arg, node)
-        return self.generic_visit(node)
+            self._set_import_locals(node, _get_importfrom_local_name)
     
-    def visit_Name(self, node: _typing.Name) -> _typing.Name:
-        if is_assign_name(node) or is_del_name(node):
-            _set_local(node.parent, node.id, node)
-        return self.generic_visit(node)
-    
-    def visit_Attribute(self, node: _typing.Attribute) -> _typing.Attribute:
-        if is_assign_name(node) and (not 
-          # Prohibit a local save if we are in an ExceptHandler.
-          any(isinstance(o, ast.ExceptHandler) for o in node.node_ancestors())):
-            self.parser._assignattr.append(node)
-        return self.generic_visit(node)
+    def visit_ExceptHandler(self, node: _typing.ExceptHandler) -> None:
+        # decremented once all the handler's descendants have been visited, see visit()
+        self._in_except_handler += 1
     
     # Transform statement level __all__.extend() and __all__.append() into augmented assignments
     # TODO: think of a more extensible way to transform the tree, it should not be necessary to traverse it twise, though.
-    def visit_Expr(self, node:_typing.Expr) -> Union[_typing.Expr, _typing.AugAssign]:
+    def visit_Expr(self, node:_typing.Expr) -> Optional[_typing.AugAssign]:
+        # Reject the common case with exact type checks first.
         v = node.value
-        if isinstance(v, ast.Call) and isinstance(v.func, ast.Attribute):
-            o = v.func.value
-            a = v.func.attr
-
-            if len(v.args)==1 and len(v.keywords)==0:
-                # We can safely apply this transformation because we know __all__ should be a list or tuple.
-                if isinstance(o, ast.Name) and o.id == '__all__':
-                    aug = None
-                    if a == 'extend':
-                        node._report("Transforming __all__.extend() into an augmented assigment")
-                        aug = ast.AugAssign(ast.Name(o.id, ast.Store()), ast.Add(), v.args[0])
-                    elif a == 'append':
-                        node._report("Transforming __all__.append() into an augmented assigment")
-                        aug = ast.AugAssign(ast.Name(o.id, ast.Store()), ast.Add(), ast.List(elts=[v.args[0]]))
-                    if aug:
-                        return fix_ast(self.visit(aug), parent=node.parent)
-
-        return self.generic_visit(node)
+        if type(v) is not ast.Call:
+            return None
+        func = v.func
+        if type(func) is not ast.Attribute:
+            return None
+        o = func.value
+        if type(o) is not ast.Name or o.id != '__all__':
+            return None
+        
+        a = func.attr
+        if len(v.args)==1 and len(v.keywords)==0:
+            # We can safely apply this transformation because we know __all__ should be a list or tuple.
+            # The argument is reused as is, only the new wrapper nodes get a location: 
+            # this avoids walking the argument subtree with ast.fix_missing_locations().
+            arg = v.args[0]
+            value: ast.expr
+            if a == 'extend':
+                node._report("Transforming __all__.extend() into an augmented assigment")
+                value = arg
+            elif a == 'append':
+                node._report("Transforming __all__.append() into an augmented assigment")
+                value = ast.copy_location(ast.List(elts=[arg], ctx=ast.Load()), arg)
+            else:
+                return None
+            target = ast.copy_location(ast.Name(o.id, ast.Store()), o)
+            # The new node is visited in place of this one, the argument has not been visited yet.
+            return cast(_typing.AugAssign, ast.copy_location(ast.AugAssign(target, ast.Add(), value), node))
+        return None
 
 class Parser:
     """
@@ -211,25 +379,50 @@ class Parser:
     """
     max_inferable_values = 42
 
-    def __init__(self) -> None:
-        self.modules:Dict[str, _typing.Module] = {}
+    def __init__(self, *, inference_cache_size: Optional[int] = 4096, 
+                 parse_cache_size: int = 0, 
+                 max_cached_modules: Optional[int] = None) -> None:
+        """
+        :param inference_cache_size: The maximum number of inferred nodes to keep in 
+            the inference cache, the least recently used ones are discarded first.
+            Use ``None`` for an unbounded cache.
+        :param parse_cache_size: The maximum number of entries in the parse cache, 
+            see `parse`. It's disabled by default.
+        :param max_cached_modules: If not ``None``, the parser only keeps strong references to 
+            this number of the most recently added modules: the older ones are dropped from 
+            `modules` as soon as they are garbage collected. This is meant for long running processes.
+        """
+        self.modules:MutableMapping[str, _typing.Module] = (
+            {} if max_cached_modules is None else weakref.WeakValueDictionary())
         """
         The parsed modules.
         """
 
-        self._assignattr:List[_typing.Attribute] = []
+        self._strong_modules: Optional['OrderedDict[str, _typing.Module]'] = (
+            None if max_cached_modules is None else OrderedDict())
+        self._max_cached_modules = max_cached_modules
+
+        self._assignattr:Dict[str, List[_typing.Attribute]] = {}
         """
-        A list to store assignments to attributes. 
+        Module names to the assignments to attributes of the module. 
 
-        We might want to resolve them after building.
+        We might want to resolve them after building, see `_drain_deferred`.
         """
 
-        self._wildcard_import:List[_typing.ImportFrom] = []
+        self._wildcard_import:Dict[str, List[_typing.ImportFrom]] = {}
         """
-        Store wildcard ImportFrom to resolve them after building.
+        Module names to the wildcard ImportFrom of the module, to resolve them after building.
         """
 
-        self._inference_cache: _context._InferenceCache = {}
+        self._inference_generation = 0
+        """
+        Incremented each time the inference cache is invalidated, 
+        it tells whether the results memoized on the nodes are still valid, see `inference.infer`.
+        """
+
+        self._inference_cache: _context._InferenceCache = (
+            {} if inference_cache_size is None else 
+            _context._LRUInferenceCache(inference_cache_size))
         """
         Inferred node contexts to their mapped results.
 
@@ -239,27 +432,62 @@ class Parser:
         """
         # Since astuce in not inter-procedural, like astroid, we don't have 
         # to use the boundnode, callcontext, ect 
+
+        self._parse_cache: 'OrderedDict[Tuple[Any, ...], Tuple[str, _typing.Module]]' = OrderedDict()
+        """
+        Source hash, module name, is_package and parse() keywords to the source and the resulting module.
+
+        Only modules that are still registered in `modules` are kept in this cache.
+        """
+        self._parse_cache_size = parse_cache_size
     
     def invalidate_inference_cache(self) -> None:
         """
         Clears the inference cache.
         """
         self._inference_cache.clear()
+        self._inference_generation += 1
+
+    def reset(self) -> None:
+        """
+        Forget about all the modules, so the parser can be reused as if it was new.
+
+        The options given to the constructor are kept.
+        """
+        self.modules.clear()
+        if self._strong_modules is not None:
+            self._strong_modules.clear()
+        self._assignattr.clear()
+        self._wildcard_import.clear()
+        self._parse_cache.clear()
+        self.invalidate_inference_cache()
+
+    def disable_parse_cache(self) -> None:
+        """
+        Clears the parse cache and stop using it.
+        """
+        self._parse_cache_size = 0
+        self._parse_cache.clear()
 
-    # @lru_cache
     def unparse(self, node: ast.AST) -> str:
         """
         Unparse an ast.AST object and generate a code string.
+
+        The result is memoized on the node itself, in the ``_unparsed`` attribute.
         """
+        unparsed: Optional[str] = getattr(node, '_unparsed', None)
+        if unparsed is not None:
+            return unparsed
         strip_extra_parenthesis = True # could be made an argument?
         try:
             unparsed = _unparse(node).strip()
             # Workaround the extra parenthesis added by the unparse() function.
             if strip_extra_parenthesis and unparsed.startswith('(') and unparsed.endswith(')'):
                 unparsed = unparsed[1:-1]
-            return unparsed
         except Exception as e:
             raise ValueError(f"can't unparse {node}") from e
+        node._unparsed = unparsed
+        return unparsed
 
     def parse(self, source:str, modname:str, *, is_package:bool=False, **kw:Any) -> _typing.Module:
         """
@@ -279,10 +507,68 @@ class Parser:
 
             - ``filename``: The filename where we can find the module source
                 (only used for error messages)
+        
+        When the parse cache is enabled (see the ``parse_cache_size`` argument of `Parser`), 
+        if the same source has already been parsed with the same arguments and 
+        the resulting module is still the registered one for this name, 
+        the very same `ast.Module` object is returned as is: 
+        it's not parsed nor visited again and the inference cache is left untouched, 
+        so any change made to the tree since is kept.
         """
+        key: Optional[Tuple[Any, ...]] = None
+        if self._parse_cache_size > 0:
+            # The hash of a string is computed once and stored on the object, 
+            # collisions are ruled out by comparing the sources.
+            key = (hash(source), modname, is_package, tuple(sorted(kw.items())))
+            try:
+                cached = self._parse_cache.get(key)
+            except TypeError:
+                # unhashable keyword argument value
+                key = None
+            else:
+                if cached is not None:
+                    cached_source, cached_mod = cached
+                    if (self.modules.get(modname) is cached_mod and 
+                        (cached_source is source or cached_source == source)):
+                        self._parse_cache.move_to_end(key)
+                        return cached_mod
+                    del self._parse_cache[key]
+        
         mod = cast(_typing.Module, _parse(source, **kw))
-        return self.add(mod, modname, is_package=is_package, **kw)
+        mod = self.add(mod, modname, is_package=is_package, **kw)
+        
+        if key is not None:
+            self._parse_cache[key] = (source, mod)
+            if len(self._parse_cache) > self._parse_cache_size:
+                self._parse_cache.popitem(last=False)
+        return mod
     
+    def parse_many(self, sources: Iterable[Tuple[str, str, bool]], *, 
+                   disable_gc: bool = False, **kw:Any) -> List[_typing.Module]:
+        """
+        Parse several modules, see `parse`.
+
+        :param sources: Tuples (source, modname, is_package).
+        :param disable_gc: Pause the cyclic garbage collector while parsing the batch. 
+            Building the trees allocates a lot of objects that all stay alive, 
+            so the collector would traverse them over and over for nothing. 
+            This switches off the collector for the whole process: 
+            don't use it if other threads rely on it.
+        :param kw: Passed to `parse` for every module.
+        :returns: The modules, in the same order. 
+            They are all registered in this parser and share its inference cache.
+        """
+        # don't re-enable the collector if the caller disabled it
+        pause_gc = disable_gc and gc.isenabled()
+        if pause_gc:
+            gc.disable()
+        try:
+            return [self.parse(source, modname, is_package=is_package, **kw) 
+                    for source, modname, is_package in sources]
+        finally:
+            if pause_gc:
+                gc.enable()
+
     def add(self, mod:ast.Module, modname:str, *, is_package:bool=False, **kw:Any) -> _typing.Module:
         """
         Add a module to the parser and make compatible with astuce inference system.
@@ -304,13 +590,53 @@ class Parser:
         
         # Store module name
         mod._modname = modname
+
+        self._register_module(mod, modname)
+
+        # Add attributes to AST nodes, build locals, apply transformations.
+        assert isinstance(mod, ast.Module)
+        # A new visitor per module: it holds the state of the walk, 
+        # so nested or concurrent calls don't interfere.
+        return cast(_typing.Module, _AstuceModuleVisitor(self).visit(mod))
+
+    def _register_module(self, mod:_typing.Module, modname:str) -> None:
+        """
+        Store the module under the given name and invalidate the inference cache.
+        """
+        # When a module is re-parsed (i.e the file changed), drop the references we
+        # still hold on the nodes of the previous tree, so it can be garbage collected.
+        old = self.modules.get(modname)
+        if old is not None and old is not mod:
+            self._release_module(old)
         self.modules[modname] = mod
 
+        strong = self._strong_modules
+        if strong is not None:
+            strong[modname] = mod
+            strong.move_to_end(modname)
+            if len(strong) > self._max_cached_modules: # type:ignore[operator]
+                # The module is still available until it's garbage collected.
+                _, evicted = strong.popitem(last=False)
+                self._release_module(evicted)
+
         # Invalidate inference cache
         self.invalidate_inference_cache()
 
-        # Add attributes to AST nodes, build locals, apply transformations.
-        return _AstuceModuleVisitor(self).visit(mod)
+    def _release_module(self, mod:_typing.Module) -> None:
+        """
+        Forget about the deferred nodes and the parse cache entries of the given module.
+        """
+        for key in [k for k, (_, m) in self._parse_cache.items() if m is mod]:
+            del self._parse_cache[key]
+        self._drain_deferred(mod)
+
+    def _drain_deferred(self, mod:_typing.Module) -> Tuple[List[_typing.Attribute], List[_typing.ImportFrom]]:
+        """
+        Pop the deferred nodes of the given module: the assignments to attributes and the wildcard imports.
+        """
+        modname = mod._modname
+        return (self._assignattr.pop(modname, []), 
+                self._wildcard_import.pop(modname, []))
 
     def _new_context(self) -> _context.InferenceContext:
         """
@@ -325,16 +651,18 @@ class Parser:
         node.parent = parent
         node._parser = self
 
+        kind = _get_node_kind(node)
+        
         # Set '_locals' attribute on scoped nodes only
-        if is_scoped_node(node):
-            if getattr(node, '_locals', None) is None:
+        if kind is _SCOPED:
+            if node._locals is None:
                 node._locals = {}
         
         # Init instance 'type_info' attribute
-        if isinstance(node, Instance):
+        elif kind is _INSTANCE:
             if getattr(node, 'type_info', None) is None:
                 node._init_type_info()
-        
+
 
 _default_parser = Parser()
 def parse(source:str, modname:str, is_package:bool=False, **kw:Any) -> _typing.Module:
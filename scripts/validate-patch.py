@@ -12,9 +12,6 @@ import ast
 from pathlib import Path
 
 import requests
-from astuce.inference import safe_infer
-from astuce.parser import parse
-from astuce.nodes import nodes_of_class
 
 # Ignore classes that are not concrete
 exclude_list = ["AST",
@@ -36,21 +33,29 @@ exclude_list = ["AST",
                 "Param",
                 ""]
 
+# This is only structural inspection, so we use the standard library 
+# ast.parse() and ast.walk() rather than the astuce parser.
+
 def patched_names(astuce_init_ast:ast.Module) -> set[str]:
     # Get the names of the classes that we pat by looking at the 
     # addMixinPatch() calls.
 
-    def predicate(call: ast.Call) -> bool:
-        return call.func.unparse().endswith('addMixinPatch')
+    def predicate(node: ast.AST) -> bool:
+        if not isinstance(node, ast.Call):
+            return False
+        func = node.func
+        name = func.attr if isinstance(func, ast.Attribute) else getattr(func, 'id', None)
+        return name == 'addMixinPatch'
 
     s = set()
     
-    for node in nodes_of_class(astuce_init_ast, ast.Call, predicate):
+    for node in filter(predicate, ast.walk(astuce_init_ast)):
         assert isinstance(node, ast.Call)
-        v = safe_infer(node.args[1])
-        if not v:
+        # The class name is always given as a string literal.
+        v = node.args[1]
+        if not isinstance(v, ast.Constant):
             continue
-        _name = ast.literal_eval(v)
+        _name = v.value
         assert isinstance(_name, str)
         s.add(_name)
     
@@ -59,7 +64,9 @@ def patched_names(astuce_init_ast:ast.Module) -> set[str]:
 def ast_classes(ast_stubs_ast:ast.Module) -> set[str]:
     s = set()
     
-    for node in nodes_of_class(ast_stubs_ast, ast.ClassDef):
+    for node in ast.walk(ast_stubs_ast):
+        if not isinstance(node, ast.ClassDef):
+            continue
         _name = node.name
         if _name in exclude_list:
             continue
@@ -72,8 +79,8 @@ if __name__ == "__main__":
     ast_stubs_contents = requests.get('https://raw.githubusercontent.com/python/typeshed/master/stdlib/_ast.pyi').text
     astuce_init_contents = (Path(__file__).parent.parent / 'astuce' / '__init__.py').read_text()
 
-    classes = ast_classes(parse(ast_stubs_contents, modname='_ast'))
-    names = patched_names(parse(astuce_init_contents, modname='astuce', is_package=True))
+    classes = ast_classes(ast.parse(ast_stubs_contents))
+    names = patched_names(ast.parse(astuce_init_contents))
     extras = set()
     missing = set()
 
@@ -1,13 +1,17 @@
 
-import ast, sys, io
+import ast, sys
 import logging
-from typing import Any, List
-from textwrap import dedent
+from typing import Any, Dict, List
+import functools
+import textwrap
 
 import pytest, unittest
 
 from astuce import inference, setup_logger, nodes, parser, _typing
 
+# The same sources are dedented over and over across the test suite.
+_dedent = functools.lru_cache(maxsize=1024)(textwrap.dedent)
+
 require_version = lambda _v:pytest.mark.skipif(sys.version_info < _v, reason=f"requires python {'.'.join((str(v) for v in _v))}")
 
 def extract_node(expr: str, modname: str = 'test', allow_stmt: bool = False) -> nodes.ASTNode:
@@ -35,46 +39,68 @@ def extract_node(expr: str, modname: str = 'test', allow_stmt: bool = False) ->
 
 def fromtext(text:str, modname:str='test') -> ast.Module:
     # test fucntion
-    return parser.Parser().parse(dedent(text), modname)
+    return parser.Parser().parse(_dedent(text), modname)
+
+# The parser shared by all AstuceTestCase, it's reset after each test.
+_test_parser = parser.Parser()
 
 class AstuceTestCase(unittest.TestCase):
 
     def setUp(self):
-        self.parser = parser.Parser()
+        self.parser = _test_parser
+    
+    def tearDown(self):
+        self.parser.reset()
 
     def parse(self, source:str, modname:str='test', **kw:Any) -> _typing.Module:
-        return self.parser.parse(dedent(source), modname, **kw)
+        return self.parser.parse(_dedent(source), modname, **kw)
+    
+    def parse_many(self, sources:Dict[str, str], **kw:Any) -> Dict[str, _typing.Module]:
+        """
+        Parse several independent modules in one batch, see `Parser.parse_many`.
+
+        :param sources: Mapping of modname to source.
+        """
+        mods = self.parser.parse_many(((_dedent(src), modname, False) for modname, src in sources.items()), **kw)
+        return dict(zip(sources, mods))
 
 _logger = setup_logger(verbose=True)
 
+class _ListHandler(logging.Handler):
+    """
+    Logging handler that appends the formatted records to a list.
+    """
+    def __init__(self, sink: List[str]) -> None:
+        super().__init__(logging.DEBUG)
+        self.sink = sink
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        # keep one item per line, like the lines of a stream
+        self.sink.extend(self.format(record).splitlines())
+
 class capture_output(list):        
     def __enter__(self):
-        self._stream = io.StringIO()
-        self.handler = logging.StreamHandler(self._stream)
-        self.handler.setLevel(logging.DEBUG)
+        self.handler = _ListHandler(self)
         self.handler.setFormatter(logging.Formatter("%(message)s"))
         _logger.addHandler(self.handler)
 
         return self
 
     def __exit__(self, *args):
-        self._stream.flush()
-        self.extend(self._stream.getvalue().splitlines())
         _logger.removeHandler(self.handler)
 
 def get_load_names(node:_typing.ASTNode, name:str) -> List[ast.Name]:
-    return [n for n in nodes.nodes_of_class(
-        node, ast.Name, 
-        predicate= lambda n: nodes.get_context(n) == nodes.Context.Load) 
-        
-        if n.id == name]
+    # check the name first, it's the most selective test. 
+    # Name nodes always have a ctx field, no need for nodes.get_context().
+    Load = ast.Load
+    return [n for n in nodes.nodes_of_class(node, ast.Name) 
+            if n.id == name and type(n.ctx) is Load]
 
 def get_exprs(nodes:List[_typing.ASTNode]) -> List[_typing.ASTexpr]:
     """
     Get all expressions wrapped inside ast.Expr in the list, 
     except the one added by astuce.
     """
-    filtered_body = [o.value for o in filter(
-            lambda o: not inference._is_end_of_frame_sentinel(o) 
-                and isinstance(o, ast.Expr), nodes)]
-    return filtered_body
+    is_end_of_frame_sentinel = inference._is_end_of_frame_sentinel
+    return [o.value for o in nodes 
+            if type(o) is ast.Expr and not is_end_of_frame_sentinel(o)]
@@ -4,7 +4,7 @@ import ast
 
 from astuce import inference, nodes
 from astuce._assigned_statements import assigned_stmts
-from astuce.nodes import nodes_of_class
+from astuce.nodes import nodes_of_class, iter_assign_names
 from . import fromtext, AstuceTestCase
 
 
@@ -49,21 +49,20 @@ class TestAssignedStatements(AstuceTestCase):
     def test_assigned_stmts_assignments(self) -> None:
         # This test ensure that the assigned_stmts() function does not 
         # actually infers tuple assigment's values
-        for firstline in ['from whatever import a,b', '', 'a,b=None,None']:
-            assign_stmts = [o for o in fromtext(
-                f"""
+        mods = self.parse_many({f'test{i}': f"""
                 {firstline}
                 c = a #@
 
                 d, e = b, c #@
-                """
-                ).body if isinstance(o, ast.Assign)]
+                """ for i, firstline in enumerate(['from whatever import a,b', '', 'a,b=None,None'])})
+        for mod in mods.values():
+            assign_stmts = [o for o in mod.body if isinstance(o, ast.Assign)]
 
-            simple_assnode = next(nodes_of_class(assign_stmts[-2], ast.Name, predicate=nodes.is_assign_name))
+            simple_assnode = next(iter_assign_names(assign_stmts[-2]))
             assigned = list(assigned_stmts(simple_assnode))
             assertNameNodesEqual(["a"], assigned)
 
-            assnames = nodes_of_class(assign_stmts[-1], ast.Name, predicate=nodes.is_assign_name)
+            assnames = iter_assign_names(assign_stmts[-1])
             simple_mul_assnode_1 = next(assnames)
             assigned = list(assigned_stmts(simple_mul_assnode_1))
             assertNameNodesEqual(["b"], assigned)
@@ -79,14 +78,14 @@ class TestAssignedStatements(AstuceTestCase):
             """
             ).body
 
-        simple_annassign_node = next(nodes_of_class(annassign_stmts[0], ast.Name, predicate=nodes.is_assign_name))
+        simple_annassign_node = next(iter_assign_names(annassign_stmts[0]))
         assigned = list(assigned_stmts(simple_annassign_node))
         
         assert len(assigned) == 1
         assert isinstance(assigned[0], ast.Constant)
         assert assigned[0].value == "abc"
 
-        empty_annassign_node = next(nodes_of_class(annassign_stmts[1], ast.Name, predicate=nodes.is_assign_name))
+        empty_annassign_node = next(iter_assign_names(annassign_stmts[1]))
         assigned = list(assigned_stmts(empty_annassign_node))
         
         assert len(assigned) == 1
@@ -107,9 +106,9 @@ class TestAssignedStatements(AstuceTestCase):
         a_nodes = list(nodes_of_class(parsed, ast.Name, predicate=lambda n: n.id=='a'))
         assert len(a_nodes) == 3
         for node in a_nodes:
-            assert ast.literal_eval(list(node.infer())[0])==[], list(node.infer())
+            assert ast.literal_eval(next(node.infer()))==[], list(node.infer())
 
-        for node in nodes_of_class(parsed, ast.Name, predicate=nodes.is_assign_name):
+        for node in iter_assign_names(parsed):
             r = list(inference.infer(node.parent.value))
             assert nodes.Uninferable not in r, (ast.dump(node), r)
             # parsed._parser._report(node, 'Test logging')
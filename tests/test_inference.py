@@ -1,16 +1,18 @@
 
 import ast
-from functools import partial
+import gc
+import weakref
 from typing import Any
 
 import pytest
 
-from astuce import inference, nodes
+from astuce import inference, nodes, parser
 from astuce.exceptions import InferenceError, NameInferenceError
 from . import AstuceTestCase, get_exprs, get_load_names
 
 class Parse__all__Test(AstuceTestCase):
 
+    @pytest.mark.skip(reason="parsing __all__ is not tested yet")
     def test_parse__all__(self):
         ...
 
@@ -60,6 +62,19 @@ class Parse__all__Test(AstuceTestCase):
 
 #         assert package.exports == {"CONST_INIT", "CONST_A", "CONST_B", "CONST_C"}
 
+# (name, expression, expected value)
+_BINOPS = (
+    ("int_add", "1 + 2", 3),
+    ("int_sub", "1 - 2", -1),
+    ("float_div", "1 / 2.", 1 / 2.0),
+    ("str_mul", '"*" * 40', "*" * 40),
+    ("int_bitand", "23&20", 23 & 20),
+    ("int_bitor", "23|8", 23 | 8),
+    ("int_bitxor", "23^9", 23 ^ 9),
+    ("int_shiftright", "23 >>1", 23 >> 1),
+    ("int_shiftleft", "23 <<1", 23 << 1),
+)
+
 class FirstInfenceTests(AstuceTestCase):
     """
     From astroid basically.
@@ -68,7 +83,8 @@ class FirstInfenceTests(AstuceTestCase):
     def test_del1(self) -> None:
         code = "del undefined_attr"
         delete = self.parse(code).body[0]
-        self.assertRaises(InferenceError, next, delete.infer())
+        with self.assertRaises(InferenceError):
+            next(delete.infer())
 
     def test_del2(self) -> None:
         code = """
@@ -86,18 +102,21 @@ class FirstInfenceTests(AstuceTestCase):
         inferred = next(n_infer)
         self.assertIsInstance(inferred, ast.Constant)
         self.assertEqual(inferred.value, 1)
-        self.assertRaises(StopIteration, partial(next, n_infer))
+        with self.assertRaises(StopIteration):
+            next(n_infer)
         
         n = mod.locals["c"][0]
         n_infer = n.infer()
-        self.assertRaises(InferenceError, partial(next, n_infer))
+        with self.assertRaises(InferenceError):
+            next(n_infer)
         
         n = mod.locals["d"][0]
         n_infer = n.infer()
         inferred = next(n_infer)
         self.assertIsInstance(inferred, ast.Constant)
         self.assertEqual(inferred.value, 2)
-        self.assertRaises(StopIteration, partial(next, n_infer))
+        with self.assertRaises(StopIteration):
+            next(n_infer)
 
     def test_builtin_types(self) -> None:
         code = """
@@ -189,8 +208,8 @@ class FirstInfenceTests(AstuceTestCase):
         # self.assertEqual(inferred.name, "set")
         # self.assertIn("remove", inferred._proxied.locals)
 
+    @pytest.mark.skip(reason="subscripts are not inferred yet")
     def test_simple_subscript(self) -> None:
-        return
         code = """
             [1, 2, 3][0] 
             (1, 2, 3)[1] 
@@ -280,9 +299,8 @@ class FirstInfenceTests(AstuceTestCase):
 #         [i.value for i in test_utils.get_name_node(ast, "e", -1).infer()], [1, 3]
 #     )
 
+    @pytest.mark.skip(reason="unary operations are not inferred yet")
     def test_unary_not(self) -> None:
-        return NotImplemented
-
         for code in (
             "a = not (1,); b = not ()",
             "a = not {1:2}; b = not {}",
@@ -296,9 +314,8 @@ class FirstInfenceTests(AstuceTestCase):
             assert ast.literal_eval(next(mod.locals["a"][0].infer())) == False
             assert ast.literal_eval(next(mod.locals["b"][0].infer())) == False
 
-    @pytest.mark.xfail
+    @pytest.mark.skip(reason="unary operations are not inferred yet")
     def test_unary_op_numbers(self) -> None:
-        return
         ast_nodes = self.parse(
             """
             +1
@@ -320,41 +337,12 @@ class FirstInfenceTests(AstuceTestCase):
         self.assertIsInstance(inferred[0], ast.Constant)
         self.assertEqual(inferred[0].value, value)
 
-    def test_binary_op_int_add(self) -> None:
-        mod = self.parse("a = 1 + 2")
-        self._test_const_inferred(mod.locals["a"][0], 3)
-
-    def test_binary_op_int_sub(self) -> None:
-        mod = self.parse("a = 1 - 2")
-        self._test_const_inferred(mod.locals["a"][0], -1)
-
-    def test_binary_op_float_div(self) -> None:
-        mod = self.parse("a = 1 / 2.")
-        self._test_const_inferred(mod.locals["a"][0], 1 / 2.0)
-
-    def test_binary_op_str_mul(self) -> None:
-        mod = self.parse('a = "*" * 40')
-        self._test_const_inferred(mod.locals["a"][0], "*" * 40)
-
-    def test_binary_op_int_bitand(self) -> None:
-        mod = self.parse("a = 23&20")
-        self._test_const_inferred(mod.locals["a"][0], 23 & 20)
-
-    def test_binary_op_int_bitor(self) -> None:
-        mod = self.parse("a = 23|8")
-        self._test_const_inferred(mod.locals["a"][0], 23 | 8)
-
-    def test_binary_op_int_bitxor(self) -> None:
-        mod = self.parse("a = 23^9")
-        self._test_const_inferred(mod.locals["a"][0], 23 ^ 9)
-
-    def test_binary_op_int_shiftright(self) -> None:
-        mod = self.parse("a = 23 >>1")
-        self._test_const_inferred(mod.locals["a"][0], 23 >> 1)
-
-    def test_binary_op_int_shiftleft(self) -> None:
-        mod = self.parse("a = 23 <<1")
-        self._test_const_inferred(mod.locals["a"][0], 23 << 1)
+    def test_binary_op(self) -> None:
+        # parse all operations at once
+        mod = self.parse("\n".join(f"a_{name} = {expression}" for name, expression, _ in _BINOPS))
+        for name, _, value in _BINOPS:
+            with self.subTest(name):
+                self._test_const_inferred(mod.locals[f"a_{name}"][0], value)
 
     def test_nonregr_multi_referential_addition(self) -> None:
         """Regression test for https://github.com/PyCQA/astroid/issues/483
@@ -475,7 +463,7 @@ class FirstInfenceTests(AstuceTestCase):
             3 / 1j 
             """
             ).body]
-        expected_values = [2.0, 1.0, 1.0, 1.0, 1 + 1j, 2j, 2 - 1j, -3j]
+        expected_values = (2.0, 1.0, 1.0, 1.0, 1 + 1j, 2j, 2 - 1j, -3j)
         for node, expected in zip(ast_nodes, expected_values):
             inferred = next(node.infer())
             self.assertEqual(inferred.value, expected)
@@ -508,7 +496,7 @@ class FirstInfenceTests(AstuceTestCase):
             # A() + A() #@
             """
             ).body]
-        expected_values = [2, 0, "ab"]
+        expected_values = (2, 0, "ab")
         for node, expected in zip(ast_nodes, expected_values):
             inferred = next(node.infer())
             self.assertIsInstance(inferred, ast.Constant)
@@ -571,8 +559,9 @@ class FirstInfenceTests(AstuceTestCase):
         [0, *var, 4, *[*bar, *foo]] #@
         """
         statements = get_exprs(self.parse(code).body)
-        self.assertEqual(next(statements[-7].infer()), statements[-7])
-        self.assertEqual(ast.literal_eval(next(statements[-7].infer())), ast.literal_eval(statements[-7]))
+        inferred = next(statements[-7].infer())
+        self.assertEqual(inferred, statements[-7])
+        self.assertEqual(ast.literal_eval(inferred), ast.literal_eval(statements[-7]))
         self.assertEqual(ast.literal_eval(next(statements[-6].infer())), [0, 1, 2, 3, 4, 5, 6, 7, 999, 1000, 1001, 3.14, 42])
         self.assertEqual(ast.literal_eval(next(statements[-5].infer())), [0, 1, 2, 3])
         self.assertEqual(ast.literal_eval(next(statements[-4].infer())), [0, 1, 2, 3, 4])
@@ -661,3 +650,37 @@ class FirstInfenceTests(AstuceTestCase):
 
 #         inferred_unknown = next(ast[4].infer())
 #         assert inferred_unknown == util.Uninferable
+
+class InferMemoTest(AstuceTestCase):
+
+    def test_infer_without_context_memoized(self) -> None:
+        mod = self.parse('''
+            a = 1 + 2
+            a
+            ''')
+        name = mod.body[1].value
+        first = list(name.infer())
+        assert [n.unparse() for n in first] == ['3']
+        assert name._inferred[1] == tuple(first)
+        assert list(name.infer()) == first
+        
+        # partially consumed generators are not memoized
+        other = self.parse('b = 1\nb', 'other').body[1].value
+        next(other.infer())
+        assert '_inferred' not in other.__dict__
+        
+        # the memo is invalidated with the inference cache
+        assert name._inferred[0] != self.parser._inference_generation
+        second = list(name.infer())
+        assert [n.unparse() for n in second] == ['3']
+        assert second != first
+
+    def test_inference_does_not_keep_nodes_alive(self) -> None:
+        p = parser.Parser()
+        mod = p.parse('a = 1 + 2', 'mod')
+        assert [n.unparse() for n in mod.body[0].value.infer(p._new_context())] == ['3']
+        ref = weakref.ref(mod)
+        del mod
+        p.parse('a = 2', 'mod')
+        gc.collect()
+        assert ref() is None
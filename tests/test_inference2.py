@@ -1,6 +1,5 @@
 
 import ast
-from functools import partial
 from typing import Any
 
 import pytest
@@ -1,5 +1,4 @@
 import ast
-import functools
 from typing import List
 
 from astuce import exceptions, inference, nodes
@@ -46,6 +45,22 @@ class LookupTest(AstuceTestCase):
         # assert that the 'from os import path' statement is filtered.
         assert mod.lookup('path')[1] == [mod.body[1]]
 
+    def test_filter_statement_lineno(self) -> None:
+
+        mod = self.parse('''
+            a = 1
+            a = 2
+            print(a)
+            a = 3
+            a = 4
+            print(a)
+        ''')
+        assert len(mod.locals['a']) == 4
+
+        first, second = get_load_names(mod, 'a')
+        assert first.lookup('a')[1] == [mod.body[1].targets[0]]
+        assert second.lookup('a')[1] == [mod.body[4].targets[0]]
+
     def test_annassigned_stmts(self):
         # assert that an empty annassign node name can't be resolved and returns Uninferable.
         mod = self.parse("""
@@ -104,7 +119,8 @@ class LookupTest2(AstuceTestCase):
         self.assertEqual(b_value.value, 1)
         
         # c
-        self.assertRaises(StopIteration, functools.partial(next, b_infer))
+        with self.assertRaises(StopIteration):
+            next(b_infer)
         func = mod.locals["func"][0]
         self.assertEqual(len(func.lookup("c")[1]), 1)
 
@@ -412,7 +428,8 @@ class LookupTest2(AstuceTestCase):
         obj = next(it)
         self.assertIsInstance(obj, ast.Constant)
         self.assertEqual(obj.value, 10)
-        self.assertRaises(StopIteration, functools.partial(next, it))
+        with self.assertRaises(StopIteration):
+            next(it)
 
     def test_inner_decorator_member_lookup(self) -> None:
         code = """
@@ -431,7 +448,8 @@ class LookupTest2(AstuceTestCase):
         it = decname.infer()
         obj = next(it)
         self.assertIsInstance(obj, ast.FunctionDef)
-        self.assertRaises(StopIteration, functools.partial(next, it))
+        with self.assertRaises(StopIteration):
+            next(it)
         assert isinstance(obj.body[0], ast.Return)
 
     def test_static_method_lookup(self) -> None:
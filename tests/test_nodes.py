@@ -7,7 +7,7 @@ import ast
 
 import pytest
 
-from astuce import nodes, _typing
+from astuce import exceptions, nodes, _typing
 from . import AstuceTestCase, require_version
 
 CODE_IF_BRANCHES_STATEMENTS = """
@@ -370,3 +370,101 @@ class TestScopeNode(AstuceTestCase):
         assert comprehension.generators[0].ifs[0].scope == comprehension
 
         # TODO: test scope of arg nodes
+
+class ParentOfTest(AstuceTestCase):
+
+    def test_parent_of(self) -> None:
+        mod = self.parse('''
+            class A:
+                def f(self):
+                    x = 1
+            y = 2
+            ''')
+        other = self.parse('''
+            class A:
+                def f(self):
+                    x = 1
+            ''', 'other')
+        
+        cls, assign = mod.body[0], mod.body[1]
+        name_x = cls.body[0].body[0].targets[0]
+        
+        assert mod.parent_of(name_x)
+        assert cls.parent_of(name_x)
+        assert cls.body[0].parent_of(name_x)
+        assert not cls.parent_of(assign)
+        assert not assign.parent_of(name_x)
+        assert not name_x.parent_of(name_x)
+        assert not name_x.parent_of(cls)
+        # same intervals, but not the same module
+        assert not other.body[0].parent_of(name_x)
+
+class SiblingsTest(AstuceTestCase):
+
+    def test_siblings(self) -> None:
+        mod = self.parse('''
+            a = 1
+            b = 2
+            c = 3
+            ''')
+        a, b, c, sentinel = mod.body
+        
+        assert b.siblings == [a, c, sentinel]
+        assert b.previous_siblings == [a]
+        assert b.next_siblings == [c, sentinel]
+        assert c.previous_siblings == [b, a]
+        
+        assert b.previous is a
+        assert b.next is c
+        with self.assertRaises(exceptions.LastNodeError):
+            a.previous
+        with self.assertRaises(exceptions.LastNodeError):
+            sentinel.next
+
+    def test_terminal_nodes_children(self) -> None:
+        mod = self.parse('''
+            import os
+            a = 1
+            ''')
+        const = mod.body[1].value
+        alias = mod.body[0].names[0]
+        
+        assert const.children == ()
+        assert const.children is alias.children
+        with self.assertRaises(exceptions.LastNodeError):
+            const.first_child
+        assert mod.body[1].children == [mod.body[1].targets[0], const]
+
+class NodesOfClassTest(AstuceTestCase):
+
+    def test_pre_order(self) -> None:
+        mod = self.parse('''
+            a = b(c, d.e)
+            def f(g=h):
+                return i
+            ''')
+        names = [n.id for n in nodes.nodes_of_class(mod, ast.Name)]
+        assert names == ['a', 'b', 'c', 'd', 'h', 'i']
+        assert list(nodes.nodes_of_class(mod.body[0].targets[0], ast.Name)) == [mod.body[0].targets[0]]
+        assert [n.id for n in nodes.nodes_of_class(mod, ast.Name, nodes.is_assign_name)] == ['a']
+        assert list(nodes.iter_assign_names(mod)) == list(nodes.nodes_of_class(mod, ast.Name, nodes.is_assign_name))
+        assert [type(n).__name__ for n in nodes.nodes_of_class(mod, (ast.FunctionDef, ast.Call))] == ['Call', 'FunctionDef']
+
+    def test_partial_node_before_parsing(self) -> None:
+        # a hand-built node without all its fields does not change how the parsed nodes are walked
+        call = ast.Call(func=ast.Name('f', ast.Load()))
+        assert [n.id for n in nodes.nodes_of_class(call, ast.Name)] == ['f']
+        assert nodes._get_child_fields(call) == (('func', False), ('args', True), ('keywords', True))
+        
+        mod = self.parse('''
+            f(x, lambda: y)
+            ''')
+        assert [n.id for n in nodes.nodes_of_class(mod, ast.Name)] == ['f', 'x', 'y']
+        call = mod.body[0].value
+        assert call.args[0].parent is call
+        assert call.args[1]._locals == {}
+
+    def test_deeply_nested(self) -> None:
+        # deeper than the default recursion limit
+        mod = self.parse('a = b' + ' + b' * 1500)
+        assert len(list(nodes.nodes_of_class(mod, ast.Name))) == 1502
@@ -0,0 +1,204 @@
+
+import ast
+import gc
+import sys
+import weakref
+from textwrap import dedent
+
+from astuce import parser
+
+from . import AstuceTestCase
+
+class ParserTest(AstuceTestCase):
+
+    def test_reparse_releases_deferred_nodes(self) -> None:
+        src = """
+            from os import *
+            class A:
+                def f(self):
+                    self.x = 1
+            """
+        old = self.parse(src, 'mod')
+        assert len(self.parser._assignattr['mod']) == 1
+        assert len(self.parser._wildcard_import['mod']) == 1
+
+        new = self.parse(src + 'x = 1', 'mod')
+        assert self.parser.modules['mod'] is new
+        assert [n.root for n in self.parser._assignattr['mod']] == [new]
+        assert [n.root for n in self.parser._wildcard_import['mod']] == [new]
+        assert old is not new
+
+        assignattr, wildcard_import = self.parser._drain_deferred(new)
+        assert [n.attr for n in assignattr] == ['x']
+        assert [n.module for n in wildcard_import] == ['os']
+        assert self.parser._drain_deferred(new) == ([], [])
+
+    def test_assignattr_not_in_except_handler(self) -> None:
+        mod = self.parse('''
+            class A:
+                def f(self):
+                    try:
+                        self.a = 1
+                    except ValueError:
+                        self.b = 1
+                        try:
+                            pass
+                        except:
+                            self.c = 1
+                        self.d = 1
+                    self.e = 1
+            ''')
+        assert [n.attr for n in self.parser._assignattr['test']] == ['a', 'e']
+
+    def test_unparse_memoized(self) -> None:
+        mod = self.parse('''
+            a = [1, 2]
+            ''')
+        value = mod.body[0].value
+        unparsed = value.unparse()
+        assert unparsed == '[1, 2]'
+        assert value._unparsed is unparsed
+        assert value.unparse() is unparsed
+
+    def test_inference_cache_size(self) -> None:
+        p = parser.Parser(inference_cache_size=2)
+        mod = p.parse(dedent('''
+            a = 1
+            b = 2
+            c = 3
+            '''), 'test')
+        for name in 'abc':
+            list(mod.body[-1].lookup(name)[1][0].infer(p._new_context()))
+            assert len(p._inference_cache) <= 2
+        assert len(p._inference_cache) == 2
+
+        p = parser.Parser(inference_cache_size=None)
+        assert type(p._inference_cache) is dict
+
+    def test_parse_cache(self) -> None:
+        # disabled by default
+        p = parser.Parser()
+        assert p.parse('a = 1', 'mod') is not p.parse('a = 1', 'mod')
+        
+        p = parser.Parser(parse_cache_size=2)
+        src = 'a = 1'
+        mod = p.parse(src, 'mod')
+        assert p.parse(src, 'mod') is mod
+        # an equal source string hits the cache as well
+        assert p.parse(''.join(['a = ', '1']), 'mod') is mod
+        assert p.parse(src, 'mod', is_package=True) is not mod
+        
+        # the cached module is not the registered one anymore
+        assert p.parse(src, 'mod') is not mod
+        assert len(p._parse_cache) == 1
+        
+        p.disable_parse_cache()
+        mod = p.parse(src, 'mod')
+        assert p.parse(src, 'mod') is not mod
+        assert not p._parse_cache
+
+    def test_all_transform_locations(self) -> None:
+        mod = self.parse('''
+            __all__ = []
+            if True:
+                __all__.extend(['a'])
+            __all__.append('b')
+            ''')
+        ext = mod.body[1].body[0]
+        app = mod.body[2]
+        assert isinstance(ext, ast.AugAssign)
+        assert isinstance(app, ast.AugAssign)
+        assert (ext.lineno, ext.col_offset) == (4, 4)
+        assert (app.lineno, app.col_offset) == (5, 0)
+        assert ext.target.lineno == 4
+        assert app.value.lineno == 5
+        assert ext.parent is mod.body[1]
+        assert app.value.elts[0].parent is app.value
+        assert app.unparse() == "__all__ += ['b']"
+
+    def test_unparse_does_not_keep_nodes_alive(self) -> None:
+        p = parser.Parser()
+        mod = p.parse('a = [1, 2]', 'mod')
+        assert mod.body[0].value.unparse() == '[1, 2]'
+        ref = weakref.ref(mod)
+        del mod
+        p.parse('a = [1, 2, 3]', 'mod')
+        gc.collect()
+        assert ref() is None
+
+    def test_shared_nodes_not_walked(self) -> None:
+        mod = self.parse('''
+            a = b + 1 if b < 2 else -b
+            ''')
+        assign = mod.body[0]
+        assert assign.targets[0].ctx._enter == -1
+        binop = assign.value.body
+        assert binop.op._enter == -1
+        assert assign.value.test.ops[0]._enter == -1
+        assert assign.value.orelse.op._enter == -1
+        assert binop.right.parent is binop
+        assert binop._exit == binop.right._exit
+
+    def test_dotted_import_names_interned(self) -> None:
+        mod = self.parse('''
+            import os.path
+            ''')
+        name, = mod._locals
+        assert name == 'os'
+        assert name is sys.intern('os')
+
+    def test_max_cached_modules(self) -> None:
+        p = parser.Parser(max_cached_modules=2, parse_cache_size=8)
+        for i in range(3):
+            p.parse('class A:\n def f(self):\n  self.a = 1', f'm{i}')
+        gc.collect()
+        assert sorted(p.modules) == ['m1', 'm2']
+        assert sorted(p._assignattr) == ['m1', 'm2']
+        # the parse cache does not keep the evicted modules alive
+        assert sorted(modname for _, modname, _, _ in p._parse_cache) == ['m1', 'm2']
+        
+        # re-adding a module makes it the most recent one
+        p.add(p.modules['m1'], 'm1')
+        p.parse('a = 1', 'm3')
+        gc.collect()
+        assert sorted(p.modules) == ['m1', 'm3']
+
+    def test_parse_many(self) -> None:
+        p = parser.Parser()
+        pack, mod = p.parse_many([('from .mod import a', 'pack', True), 
+                                  ('a = 1', 'pack.mod', False)])
+        assert p.modules['pack'] is pack
+        assert p.modules['pack.mod'] is mod
+        assert pack._is_package
+        
+        p.parse_many([('a = 2', 'pack.mod', False)], disable_gc=True)
+        assert gc.isenabled()
+        gc.disable()
+        try:
+            p.parse_many([('a = 3', 'pack.mod', False)], disable_gc=True)
+            assert not gc.isenabled()
+        finally:
+            gc.enable()
+
+    def test_parser_attribute(self) -> None:
+        mod = self.parse('''
+            def f():
+                return a.b
+            ''')
+        attr = mod.body[0].body[0].value
+        assert '_parser' in mod.__dict__
+        assert '_parser' not in attr.__dict__
+        assert attr._parser is self.parser
+        assert attr.value._parser is self.parser
+
+    def test_reset(self) -> None:
+        p = parser.Parser(max_cached_modules=3, parse_cache_size=8)
+        mod = p.parse('class A:\n def f(self):\n  self.a = 1', 'mod')
+        list(mod.body[0].body[0].body[0].targets[0].value.infer())
+        p.reset()
+        assert not p.modules
+        assert not p._strong_modules
+        assert not p._assignattr
+        assert not p._parse_cache
+        assert not p._inference_cache
+        assert p.parse('class A:\n def f(self):\n  self.a = 1', 'mod') is not mod